@@ -12,6 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+import os
+
+import six
+
 from ._authinfo import *
 from ._utils import *
 
@@ -21,14 +26,49 @@ __all__ = ['DummyMiddleware']
 
 DUMMY_AUTH_INFO_KEY = 'dummy.auth_info'
 
+# Load-test mode must also be allowed via the process environment, so that
+# a stray load_test=True in a deployed config does nothing but fail loudly.
+DUMMY_LOAD_TEST_ENV = 'FLUPAUTH_ALLOW_LOAD_TEST'
+
 
 class DummyMiddleware(object):
 
     def __init__(self, application, username,
-                 app_id=None, global_ttl=None, auth_info_service=None):
+                 app_id=None, global_ttl=None, auth_info_service=None,
+                 load_test=False, identity_header=None, user_pool_size=None):
         self._application = application
         self._username = username
 
+        if isinstance(load_test, six.string_types):
+            if load_test.lower() in ('true', 'yes', 'on', '1'):
+                load_test = True
+            elif load_test.lower() in ('false', 'no', 'off', '0', ''):
+                load_test = False
+            else:
+                raise ValueError('invalid load_test value: %r' % load_test)
+        elif not isinstance(load_test, bool):
+            raise ValueError('invalid load_test value: %r' % (load_test,))
+
+        if load_test:
+            if os.environ.get(DUMMY_LOAD_TEST_ENV) != '1':
+                raise ValueError('load_test requires %s=1 in the environment' %
+                                 DUMMY_LOAD_TEST_ENV)
+
+            self._identity_key = None
+            if identity_header is not None:
+                self._identity_key = 'HTTP_' + \
+                    identity_header.upper().replace('-', '_')
+
+            if user_pool_size is not None:
+                user_pool_size = int(user_pool_size)
+                if user_pool_size <= 0:
+                    raise ValueError('user_pool_size must be greater than 0')
+            self._user_pool_size = user_pool_size
+            self._user_counter = itertools.count()
+        elif identity_header is not None or user_pool_size is not None:
+            raise ValueError('identity_header and user_pool_size require load_test')
+        self._load_test = load_test
+
         if app_id is None:
             app_id = generate_nonce(16)
 
@@ -37,6 +77,11 @@ class DummyMiddleware(object):
         self._auth_info_service = auth_info_service
 
     def __call__(self, environ, start_response):
+        if self._load_test:
+            environ['AUTH_TYPE'] = 'DUMMY'
+            environ['REMOTE_USER'] = self._get_load_test_user(environ)
+            return self._application(environ, start_response)
+
         session = self._get_session(environ)
         if DUMMY_AUTH_INFO_KEY in session:
             # Possibly already authenticated
@@ -55,6 +100,23 @@ class DummyMiddleware(object):
         ])
         return []
 
+    def _get_load_test_user(self, environ):
+        # Load-test mode: no session, no redirect. The identity header's
+        # value (if present) is used as-is. Otherwise, each request takes
+        # the next of user_pool_size synthetic users named username + index,
+        # round-robin per process, so even a single client covers the
+        # whole pool.
+        if self._identity_key is not None:
+            username = environ.get(self._identity_key)
+            if username:
+                return username
+
+        if self._user_pool_size is not None:
+            index = next(self._user_counter) % self._user_pool_size
+            return '%s%d' % (self._username, index)
+
+        return str(self._username)
+
     def _get_session(self, environ):
         return environ['flup.session']()
 